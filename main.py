@@ -1,31 +1,196 @@
+import asyncio
+import functools
+import logging
 import os
-from typing import List, Any, Dict
-from fastapi import FastAPI, HTTPException
+import time
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import List, Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+import msgspec
+import orjson
+from bson import ObjectId
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 
 from database import db, create_document, get_documents
 from schemas import Project, Submission
 
+logger = logging.getLogger("uvicorn.error")
+
 app = FastAPI()
 
+# Comma-separated list of frontend origins; falls back to any origin when unset
+_CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=_CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
 )
+# List payloads repeat the same keys and URL prefixes and compress well;
+# tiny bodies such as /api/hello are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
+
+# Static payloads are encoded once at import time
+_ROOT_BODY = orjson.dumps({"message": "Hello from FastAPI Backend!"})
+_HELLO_BODY = orjson.dumps({"message": "Hello from the backend API!"})
 
 
 @app.get("/")
 def read_root():
-    return {"message": "Hello from FastAPI Backend!"}
+    return _json_response(_ROOT_BODY)
 
 
 @app.get("/api/hello")
 def hello():
-    return {"message": "Hello from the backend API!"}
+    return _json_response(_HELLO_BODY)
+
+
+# Upper bound for the list endpoints' limit; also bounds the (endpoint, limit)
+# response cache keys
+_MAX_LIMIT = 100
+
+# Only the fields the endpoints below actually return are fetched from Mongo
+_PROJECT_KEYS = ("title", "description", "image_url", "demo_url", "source_url", "author", "tags")
+_SUBMISSION_KEYS = ("name", "title", "description", "link", "thumbnail", "tags")
+_TIMESTAMP_KEYS = ("updated_at", "created_at")
+_PROJECT_PROJECTION = dict.fromkeys(_PROJECT_KEYS + _TIMESTAMP_KEYS, 1)
+_SUBMISSION_PROJECTION = dict.fromkeys(_SUBMISSION_KEYS + _TIMESTAMP_KEYS, 1)
+
+# Newest first; served by the compound index created at startup
+_FRESHNESS_SORT = [("updated_at", -1), ("created_at", -1)]
+
+
+def _as_naive_utc(value: Any) -> datetime:
+    """Comparable timestamp; anything that is not a datetime sorts as oldest"""
+    if not isinstance(value, datetime):
+        return datetime.min
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _freshness(doc: Dict[str, Any]) -> Tuple[bool, datetime, datetime]:
+    """Sort key following _FRESHNESS_SORT: documents without updated_at go last"""
+    updated_at = doc.get("updated_at")
+    return (updated_at is not None, _as_naive_utc(updated_at), _as_naive_utc(doc.get("created_at")))
+
+
+# Strong references to fire-and-forget tasks so they are not garbage collected
+_background_tasks: Set["asyncio.Task[None]"] = set()
+
+
+async def _create_indexes() -> None:
+    names = ("project", "submission")
+    results = await asyncio.gather(
+        *(db[name].create_index(_FRESHNESS_SORT) for name in names),
+        return_exceptions=True,
+    )
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logger.warning("Could not create index on %r: %s", name, result)
+
+
+@app.on_event("startup")
+async def ensure_indexes():
+    """Create the index backing the newest-first sort on the list endpoints.
+
+    create_index is idempotent, so this runs on every boot. It runs in the
+    background so startup does not wait on server selection when Mongo is
+    slow or unreachable; failures are logged instead of raised.
+    """
+    if db is None:
+        return
+    task = asyncio.create_task(_create_indexes())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _encode_default(obj: Any) -> Any:
+    """Encode Mongo types orjson and msgspec have no native support for"""
+    if isinstance(obj, ObjectId):
+        return obj.binary.hex()
+    raise TypeError
+
+
+# pymongo returns naive datetimes that are UTC; emit them with a "Z" suffix
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def _dumps(content: Any) -> bytes:
+    """Serialize with orjson, bypassing FastAPI's jsonable_encoder"""
+    return orjson.dumps(content, default=_encode_default, option=_ORJSON_OPTIONS)
+
+
+def _json_response(body: bytes) -> Response:
+    return Response(body, media_type="application/json")
+
+
+# Serialized list responses are identical for every caller within a short
+# window, so the encoded bytes are kept per (endpoint, limit)
+_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 5))
+_CACHE: Dict[Tuple[str, int], Tuple[float, bytes]] = {}
+
+
+def _cache_get(key: Tuple[str, int]) -> Optional[bytes]:
+    hit = _CACHE.get(key)
+    if hit is not None and time.monotonic() - hit[0] < _CACHE_TTL:
+        return hit[1]
+    return None
+
+
+def _cache_put(key: Tuple[str, int], body: bytes) -> bytes:
+    _CACHE[key] = (time.monotonic(), body)
+    return body
+
+
+# Concurrent misses for the same key share one build instead of each
+# querying Mongo
+_inflight: Dict[Tuple[str, int], "asyncio.Task[bytes]"] = {}
+
+
+async def _build_and_cache(key: Tuple[str, int], build: Callable[[], Awaitable[bytes]]) -> bytes:
+    body = await build()
+    # A build that was invalidated while running must not repopulate the cache
+    if _inflight.get(key) is asyncio.current_task():
+        _cache_put(key, body)
+    return body
+
+
+def _forget_inflight(key: Tuple[str, int], task: "asyncio.Task[bytes]") -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # Mark a failure as retrieved in case every waiter was cancelled first
+    if not task.cancelled():
+        task.exception()
+
+
+async def _cached_body(key: Tuple[str, int], build: Callable[[], Awaitable[bytes]]) -> bytes:
+    """Return the cached body for key, running build at most once at a time"""
+    body = _cache_get(key)
+    if body is not None:
+        return body
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_build_and_cache(key, build))
+        _inflight[key] = task
+        task.add_done_callback(functools.partial(_forget_inflight, key))
+    # Shielded so one disconnecting caller does not cancel the shared build
+    return await asyncio.shield(task)
+
+
+def _cache_invalidate(*endpoints: str) -> None:
+    for key in list(_CACHE):
+        if key[0] in endpoints:
+            _CACHE.pop(key, None)
+    for key in list(_inflight):
+        if key[0] in endpoints:
+            _inflight.pop(key, None)
 
 
 def _serialize(doc: Dict[str, Any]) -> Dict[str, Any]:
@@ -35,86 +200,132 @@ def _serialize(doc: Dict[str, Any]) -> Dict[str, Any]:
     d = dict(doc)
     _id = d.pop("_id", None)
     if _id is not None:
-        d["id"] = str(_id)
-    # Convert datetime fields to isoformat if present
-    for k in ("created_at", "updated_at"):
-        if k in d and hasattr(d[k], "isoformat"):
-            d[k] = d[k].isoformat()
+        d["id"] = _id
+    # ObjectId and datetime values are left as-is for orjson to encode
     return d
 
 
+class PortfolioItem(msgspec.Struct):
+    """Common shape the frontend renders for projects and submissions"""
+    id: Any  # raw ObjectId, encoded by _encode_default
+    type: str
+    title: Optional[str]
+    description: Optional[str]
+    image: Optional[str]
+    demo: Optional[str]
+    source: Optional[str]
+    author: Optional[str]
+    tags: List[str]
+
+
+_portfolio_encoder = msgspec.json.Encoder(enc_hook=_encode_default)
+
+
+# The portfolio mappers read straight from the raw Mongo document
+def _normalize_project(doc: Dict[str, Any]) -> PortfolioItem:
+    return PortfolioItem(
+        id=doc["_id"],
+        type="project",
+        title=doc.get("title"),
+        description=doc.get("description"),
+        image=doc.get("image_url"),
+        demo=doc.get("demo_url"),
+        source=doc.get("source_url"),
+        author=doc.get("author"),
+        tags=doc.get("tags", []),
+    )
+
+
+def _normalize_submission(doc: Dict[str, Any]) -> PortfolioItem:
+    return PortfolioItem(
+        id=doc["_id"],
+        type="submission",
+        title=doc.get("title"),
+        description=doc.get("description"),
+        image=doc.get("thumbnail"),
+        demo=doc.get("link"),
+        source=None,
+        author=doc.get("name"),
+        tags=doc.get("tags", []),
+    )
+
+
 @app.get("/api/projects")
-def list_projects(limit: int = 24):
+async def list_projects(limit: int = Query(24, ge=1, le=_MAX_LIMIT)):
+    async def build() -> bytes:
+        items = await get_documents("project", {}, limit, _PROJECT_PROJECTION, _FRESHNESS_SORT)
+        return _dumps({"items": [_serialize(i) for i in items]})
+
     try:
-        items = get_documents("project", {}, limit)
-        return {"items": [_serialize(i) for i in items]}
+        return _json_response(await _cached_body(("projects", limit), build))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/submissions")
-def list_submissions(limit: int = 24):
+async def list_submissions(limit: int = Query(24, ge=1, le=_MAX_LIMIT)):
+    async def build() -> bytes:
+        items = await get_documents("submission", {}, limit, _SUBMISSION_PROJECTION, _FRESHNESS_SORT)
+        return _dumps({"items": [_serialize(i) for i in items]})
+
     try:
-        items = get_documents("submission", {}, limit)
-        return {"items": [_serialize(i) for i in items]}
+        return _json_response(await _cached_body(("submissions", limit), build))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/portfolio")
-def combined_portfolio(limit: int = 30):
+async def combined_portfolio(limit: int = Query(30, ge=1, le=_MAX_LIMIT)):
     """Return a combined list of curated projects and user submissions"""
-    try:
-        projects = get_documents("project", {}, limit)
-        submissions = get_documents("submission", {}, limit)
+    async def build() -> bytes:
+        # Both queries run concurrently so the round-trips overlap
+        projects, submissions = await asyncio.gather(
+            get_documents("project", {}, limit, _PROJECT_PROJECTION, _FRESHNESS_SORT),
+            get_documents("submission", {}, limit, _SUBMISSION_PROJECTION, _FRESHNESS_SORT),
+        )
         # Normalize into a common shape for the frontend
-        normalized: List[Dict[str, Any]] = []
-        for p in projects:
-            d = _serialize(p)
-            normalized.append({
-                "id": d.get("id"),
-                "type": "project",
-                "title": d.get("title"),
-                "description": d.get("description"),
-                "image": d.get("image_url"),
-                "demo": d.get("demo_url"),
-                "source": d.get("source_url"),
-                "author": d.get("author"),
-                "tags": d.get("tags", []),
-            })
-        for s in submissions:
-            d = _serialize(s)
-            normalized.append({
-                "id": d.get("id"),
-                "type": "submission",
-                "title": d.get("title"),
-                "description": d.get("description"),
-                "image": d.get("thumbnail"),
-                "demo": d.get("link"),
-                "source": None,
-                "author": d.get("name"),
-                "tags": d.get("tags", []),
-            })
-        # Sort newest first by updated_at or created_at
-        def sort_key(x):
-            return x.get("updated_at") or x.get("created_at") or ""
-        normalized = list(reversed(normalized))  # basic freshness order
-        return {"items": normalized[:limit]}
+        normalized: List[Tuple[Tuple[bool, datetime, datetime], PortfolioItem]] = [
+            (_freshness(p), _normalize_project(p)) for p in projects
+        ]
+        normalized.extend((_freshness(s), _normalize_submission(s)) for s in submissions)
+        # Interleave both collections newest first, in the same order Mongo uses
+        normalized.sort(key=itemgetter(0), reverse=True)
+        return _portfolio_encoder.encode({"items": [item for _, item in normalized[:limit]]})
+
+    try:
+        return _json_response(await _cached_body(("portfolio", limit), build))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/submit")
-def submit_portfolio(item: Submission):
+async def submit_portfolio(item: Submission):
     try:
-        new_id = create_document("submission", item)
+        # FastAPI has already validated the body; dump it once, without re-validating
+        new_id = await create_document("submission", item.model_dump(mode="json", exclude_none=True))
+        _cache_invalidate("submissions", "portfolio")
         return {"success": True, "id": new_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# /test is polled by uptime checks, so a successful collection listing is
+# reused for a while instead of hitting Mongo on every probe
+_COLLECTIONS_TTL = 30.0
+_collections_cache: Optional[Tuple[float, List[str]]] = None
+
+
+async def _list_collection_names() -> List[str]:
+    global _collections_cache
+    if _collections_cache is not None and time.monotonic() - _collections_cache[0] < _COLLECTIONS_TTL:
+        return _collections_cache[1]
+    collections = await db.list_collection_names()
+    _collections_cache = (time.monotonic(), collections)
+    return collections
+
+
 @app.get("/test")
-def test_database():
+async def test_database():
     """Test endpoint to check if database is available and accessible"""
     response = {
         "backend": "✅ Running",
@@ -135,7 +346,7 @@ def test_database():
 
             # Try to list collections to verify connectivity
             try:
-                collections = db.list_collection_names()
+                collections = await _list_collection_names()
                 response["collections"] = collections[:10]  # Show first 10 collections
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
@@ -147,9 +358,8 @@ def test_database():
         response["database"] = f"❌ Error: {str(e)[:50]}"
 
     # Check environment variables
-    import os as _os
-    response["database_url"] = "✅ Set" if _os.getenv("DATABASE_URL") else "❌ Not Set"
-    response["database_name"] = "✅ Set" if _os.getenv("DATABASE_NAME") else "❌ Not Set"
+    response["database_url"] = "✅ Set" if os.getenv("DATABASE_URL") else "❌ Not Set"
+    response["database_name"] = "✅ Set" if os.getenv("DATABASE_NAME") else "❌ Not Set"
 
     return response
 
@@ -157,4 +367,12 @@ def test_database():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Multiple workers need the app as an import string so each process loads it
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+    )
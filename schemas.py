@@ -11,9 +11,16 @@ Model name is converted to lowercase for the collection name:
 - BlogPost -> "blogs" collection
 """
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 
+
+def _check_http_url(value: Optional[str]) -> Optional[str]:
+    """Cheap sanity check for URL fields instead of a full HttpUrl parse"""
+    if value and not value.startswith(("http://", "https://")):
+        raise ValueError("URL must start with http:// or https://")
+    return value
+
 # Example schemas (replace with your own):
 
 class User(BaseModel):
@@ -47,12 +54,17 @@ class Project(BaseModel):
     """
     title: str = Field(..., description="Project title")
     description: Optional[str] = Field(None, description="Short project summary")
-    image_url: Optional[HttpUrl] = Field(None, description="Thumbnail or cover image URL")
-    demo_url: Optional[HttpUrl] = Field(None, description="Live demo link")
-    source_url: Optional[HttpUrl] = Field(None, description="Source code link")
+    image_url: Optional[str] = Field(None, max_length=2048, description="Thumbnail or cover image URL")
+    demo_url: Optional[str] = Field(None, max_length=2048, description="Live demo link")
+    source_url: Optional[str] = Field(None, max_length=2048, description="Source code link")
     author: Optional[str] = Field(None, description="Author or team name")
     tags: List[str] = Field(default_factory=list, description="List of tags")
 
+    @field_validator("image_url", "demo_url", "source_url")
+    @classmethod
+    def check_urls(cls, value: Optional[str]) -> Optional[str]:
+        return _check_http_url(value)
+
 class Submission(BaseModel):
     """
     User-submitted portfolio entries
@@ -61,10 +73,15 @@ class Submission(BaseModel):
     name: str = Field(..., description="Submitter name")
     title: str = Field(..., description="Submission title")
     description: Optional[str] = Field(None, description="Short description")
-    link: Optional[HttpUrl] = Field(None, description="External or demo link")
-    thumbnail: Optional[HttpUrl] = Field(None, description="Thumbnail image URL")
+    link: Optional[str] = Field(None, max_length=2048, description="External or demo link")
+    thumbnail: Optional[str] = Field(None, max_length=2048, description="Thumbnail image URL")
     tags: List[str] = Field(default_factory=list, description="Tags for filtering/search")
 
+    @field_validator("link", "thumbnail")
+    @classmethod
+    def check_urls(cls, value: Optional[str]) -> Optional[str]:
+        return _check_http_url(value)
+
 # Add your own schemas here:
 # --------------------------------------------------
 
@@ -73,3 +90,9 @@ class Submission(BaseModel):
 # 2. Use them for document validation when creating/editing
 # 3. Handle all database operations (CRUD) directly
 # 4. You don't need to create any database endpoints!
+
+# Make sure every validator is fully built at import time so a missing
+# forward reference or a deferred build never lands on the first request
+for _model in (User, Product, Project, Submission):
+    _model.model_rebuild()
+del _model
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    main._CACHE.clear()
+    main._inflight.clear()
+    yield
+    main._CACHE.clear()
+    main._inflight.clear()
+
+
+def test_concurrent_misses_share_one_build():
+    calls = 0
+
+    async def build() -> bytes:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"body"
+
+    async def run():
+        return await asyncio.gather(*(main._cached_body(("portfolio", 30), build) for _ in range(10)))
+
+    assert asyncio.run(run()) == [b"body"] * 10
+    assert calls == 1
+    assert main._CACHE[("portfolio", 30)][1] == b"body"
+    assert not main._inflight
+
+
+def test_invalidate_during_build_skips_write_back():
+    async def run():
+        release = asyncio.Event()
+
+        async def build() -> bytes:
+            await release.wait()
+            return b"stale"
+
+        pending = asyncio.ensure_future(main._cached_body(("portfolio", 30), build))
+        await asyncio.sleep(0)
+        main._cache_invalidate("portfolio")
+        release.set()
+        return await pending
+
+    assert asyncio.run(run()) == b"stale"
+    assert ("portfolio", 30) not in main._CACHE
+
+
+def test_failed_build_with_no_waiters_is_retrieved():
+    async def run():
+        loop = asyncio.get_running_loop()
+        unretrieved = []
+        loop.set_exception_handler(lambda _loop, context: unretrieved.append(context))
+
+        async def build() -> bytes:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("mongo down")
+
+        waiter = asyncio.ensure_future(main._cached_body(("projects", 24), build))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0.05)
+        return unretrieved
+
+    assert asyncio.run(run()) == []
+    assert not main._inflight